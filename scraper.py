@@ -11,17 +11,30 @@ Web:    https://www.tanvirhossain.net/
 """
 
 import argparse
+import asyncio
+import codecs
+import contextlib
 import logging
+import os
 import re
+import sqlite3
+import tempfile
 import time
 import unittest
-from unittest.mock import patch, Mock
-from urllib.parse import urlparse
-
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from html import unescape
+from unittest.mock import patch, MagicMock, Mock
+from urllib.parse import urlencode, parse_qsl, urlparse
+
+import aiohttp
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from ddgs import DDGS
 from googlesearch import search
+from selectolax.lexbor import LexborHTMLParser
 
 logger = logging.getLogger(__name__)
 
@@ -40,76 +53,336 @@ HEADERS = {
 }
 
 # Aggregator sites/pages known to list offers.greatclips.com coupon links.
-KNOWN_AGGREGATORS = [
+KNOWN_AGGREGATORS = (
     "https://greatclipsdeal.com/",
     "https://coupons-greatclips.com/9-99",
     "https://coupons-greatclips.com/8-99",
     "https://coupons-greatclips.com/5-off",
     "https://coupons-greatclips.com/7-99",
     "https://coupons-greatclips.com/14-99",
-]
+)
+
+# A coupon link: offers.greatclips.com with a non-empty path.
+_COUPON_URL_RE = re.compile(
+    r'^https?://offers\.greatclips\.com/[^/?#]', re.IGNORECASE
+)
+
+# Stripped from both ends of scraped hrefs, as urlparse does for leading
+# characters; scraped HTML often has stray whitespace inside href="...".
+_C0_CONTROL_OR_SPACE = "".join(chr(c) for c in range(0x21))
+
+# Politeness cap on simultaneous connections to any one host. Every coupon
+# page lives on offers.greatclips.com, so this bounds load on that host.
+MAX_CONNECTIONS_PER_HOST = 4
+
+# Bodies beyond this many bytes are truncated; some SEO aggregator pages
+# are megabytes of HTML.
+MAX_BODY_BYTES = 512 * 1024
+
+# Default on-disk cache of fetched pages, shared between runs.
+CACHE_PATH = "greatclips_cache.sqlite"
+
+# Seconds a cached page is served without revalidation. Aggregator pages
+# change more often than the coupon pages they link to.
+AGGREGATOR_CACHE_TTL = 600
+COUPON_CACHE_TTL = 24 * 60 * 60
+
+# Offer value such as "$9.99" or "$2 off".
+_OFFER_RE = re.compile(r'\$\d+(?:\.\d{2})?(?:\s*off)?', re.IGNORECASE)
+
+
+@lru_cache(maxsize=4096)  # aggregators repeat the same hrefs many times
+def _is_coupon_url_str(url):
+    """Match a string against the coupon URL shape; memoized per URL."""
+    return _COUPON_URL_RE.match(url.strip(_C0_CONTROL_OR_SPACE)) is not None
+
+
+def _canonicalize_url(url):
+    """
+    Normalize a URL for deduplication: lowercase scheme and host, drop the
+    fragment and any trailing slash, and sort query parameters (keeping
+    blank values). Path ;params are kept. URLs that cannot be parsed are
+    returned unchanged.
+    """
+    try:
+        parsed = urlparse(url)
+    except ValueError:
+        return url
+    canonical = (
+        f"{parsed.scheme.lower()}://{parsed.netloc.lower()}"
+        f"{parsed.path.rstrip('/')}"
+    )
+    if parsed.params:
+        canonical += ";" + parsed.params
+    if parsed.query:
+        query = parse_qsl(parsed.query, keep_blank_values=True)
+        canonical += "?" + urlencode(sorted(query))
+    return canonical
+
+
+def _dedupe_urls(urls):
+    """Drop URLs whose canonical form was already seen, keeping order."""
+    unique = {}
+    for url in urls:
+        unique.setdefault(_canonicalize_url(url), url)
+    return list(unique.values())
 
 
 def _make_session():
-    """Create a requests session with browser-like headers."""
+    """Create a pooled, retrying requests session with browser-like headers."""
     session = requests.Session()
     session.headers.update(HEADERS)
+    adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=64,
+        max_retries=Retry(
+            total=2,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            # urllib3 would sleep for the full Retry-After (unbounded and
+            # outside the request timeout); stick to the short backoff.
+            respect_retry_after_header=False,
+        ),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
     return session
 
 
+def _make_async_session(concurrency=20):
+    """Create an aiohttp session whose connector caps open sockets."""
+    connector = aiohttp.TCPConnector(
+        limit=concurrency, limit_per_host=MAX_CONNECTIONS_PER_HOST
+    )
+    return aiohttp.ClientSession(headers=HEADERS, connector=connector)
+
+
+class _RequestLimiter:
+    """
+    Bounds in-flight requests, overall and per host, mirroring the
+    connector limits. A slot is taken before session.get, so time spent
+    waiting for one does not count against the request timeout (aiohttp's
+    ClientTimeout also covers waiting for a pooled connection).
+    """
+
+    def __init__(self, limit=20, per_host=MAX_CONNECTIONS_PER_HOST):
+        self._total = asyncio.Semaphore(limit)
+        self._per_host = defaultdict(lambda: asyncio.Semaphore(per_host))
+
+    @contextlib.asynccontextmanager
+    async def slot(self, url):
+        # Host first: a request queued on a busy host must not hold one of
+        # the overall slots that requests to other hosts could use.
+        async with self._per_host[urlparse(url).netloc]:
+            async with self._total:
+                yield
+
+
+class _PageCache:
+    """
+    SQLite-backed store of fetched page bodies and their HTTP validators.
+
+    Writes are not committed individually, since a commit per page would
+    block the event loop on an fsync; call commit() once a batch of fetches
+    is done and close() when finished. The connection is opened lazily, so
+    a closed cache reopens on next use.
+    """
+
+    def __init__(self, path):
+        self._path = path
+        self._conn = None
+
+    def _connection(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self._path)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                " url TEXT PRIMARY KEY,"
+                " body TEXT NOT NULL,"
+                " etag TEXT,"
+                " last_modified TEXT,"
+                " fetched_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, url):
+        """Return the cached entry for `url` as a dict, or None."""
+        row = self._connection().execute(
+            "SELECT body, etag, last_modified, fetched_at"
+            " FROM pages WHERE url = ?",
+            (url,),
+        ).fetchone()
+        if row is None:
+            return None
+        body, etag, last_modified, fetched_at = row
+        return {
+            'body': body,
+            'etag': etag,
+            'last_modified': last_modified,
+            'fetched_at': fetched_at,
+        }
+
+    def set(self, url, body, etag=None, last_modified=None):
+        """Store a freshly fetched page."""
+        self._connection().execute(
+            "INSERT OR REPLACE INTO pages"
+            " (url, body, etag, last_modified, fetched_at)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (url, body, etag, last_modified, time.time()),
+        )
+
+    def touch(self, url):
+        """Mark a cached page as fresh after a 304 Not Modified."""
+        self._connection().execute(
+            "UPDATE pages SET fetched_at = ? WHERE url = ?",
+            (time.time(), url),
+        )
+
+    def commit(self):
+        """Persist all writes since the last commit."""
+        if self._conn is not None:
+            self._conn.commit()
+
+    def close(self):
+        """Commit pending writes and close the connection."""
+        if self._conn is not None:
+            self._conn.commit()
+            self._conn.close()
+            self._conn = None
+
+
 class GreatClipsScraper:
     BASE_URL = "https://offers.greatclips.com/"
 
-    def __init__(self, target_area):
+    def __init__(self, target_area, cache_path=None):
         self.target_area = target_area
+        # Matching runs on casefolded text, which is cheaper than asking
+        # the regex engine for IGNORECASE on every character.
+        self._area_cf = target_area.casefold()
+        self._area_re = re.compile(r'\b' + re.escape(self._area_cf) + r'\b')
         self.found_coupons = []
         self.session = _make_session()
+        self.cache = _PageCache(cache_path) if cache_path else None
 
     @staticmethod
     def _is_valid_coupon_url(url):
         """Validate that a URL is a proper offers.greatclips.com coupon link."""
-        try:
-            parsed = urlparse(url)
-            return (
-                parsed.scheme in ("http", "https")
-                and parsed.netloc == "offers.greatclips.com"
-                and len(parsed.path) > 1  # more than just "/"
-            )
-        except Exception:
-            return False
+        # Type check outside the cache: unhashable input must not reach it.
+        return isinstance(url, str) and _is_coupon_url_str(url)
 
     def _matches_area(self, text):
         """Word-boundary match for target area to avoid false positives."""
-        return bool(
-            re.search(
-                r'\b' + re.escape(self.target_area) + r'\b',
-                text,
-                re.IGNORECASE,
+        # Plain substring test first; the regex only confirms word boundaries.
+        text_cf = text.casefold()
+        if self._area_cf not in text_cf:
+            return False
+        return self._area_re.search(text_cf) is not None
+
+    async def _fetch(self, session, limiter, url, timeout=15, max_age=None):
+        """
+        Fetch a single URL, returning its body text or None on failure.
+
+        With a cache configured, entries younger than `max_age` seconds are
+        returned without touching the network; older ones are revalidated
+        with If-None-Match / If-Modified-Since so a 304 skips the body.
+        """
+        cached = self.cache.get(url) if self.cache else None
+        if (
+            cached
+            and max_age is not None
+            and time.time() - cached['fetched_at'] < max_age
+        ):
+            return cached['body']
+
+        headers = {}
+        if cached:
+            if cached['etag']:
+                headers["If-None-Match"] = cached['etag']
+            if cached['last_modified']:
+                headers["If-Modified-Since"] = cached['last_modified']
+
+        try:
+            async with limiter.slot(url):
+                async with session.get(
+                    url,
+                    headers=headers,
+                    timeout=aiohttp.ClientTimeout(total=timeout),
+                ) as response:
+                    if cached and response.status == 304:
+                        self.cache.touch(url)
+                        return cached['body']
+                    response.raise_for_status()
+                    chunks = []
+                    total = 0
+                    async for chunk in response.content.iter_chunked(65536):
+                        total += len(chunk)
+                        if total > MAX_BODY_BYTES:
+                            logger.warning(
+                                "Body of %s exceeds %d bytes, truncating",
+                                url, MAX_BODY_BYTES,
+                            )
+                            chunks.append(
+                                chunk[:MAX_BODY_BYTES - total + len(chunk)]
+                            )
+                            break
+                        chunks.append(chunk)
+                    # Pages sometimes declare charsets Python has no codec
+                    # for (e.g. "utf8mb4"); fall back rather than drop them.
+                    charset = response.charset or "utf-8"
+                    try:
+                        codecs.lookup(charset)
+                    except LookupError:
+                        charset = "utf-8"
+                    text = b"".join(chunks).decode(charset, errors="replace")
+                    if self.cache:
+                        self.cache.set(
+                            url,
+                            text,
+                            response.headers.get("ETag"),
+                            response.headers.get("Last-Modified"),
+                        )
+                    return text
+        except aiohttp.ClientResponseError as e:
+            logger.error("HTTP error fetching %s: %s", url, e)
+        except aiohttp.ClientConnectionError as e:
+            logger.error("Connection error fetching %s: %s", url, e)
+        except asyncio.TimeoutError as e:
+            logger.error("Timeout fetching %s: %s", url, e)
+        except Exception as e:
+            logger.error("Error fetching %s: %s", url, e)
+        return None
+
+    async def _fetch_iter(self, session, limiter, urls, timeout=15,
+                          max_age=None):
+        """
+        Fetch URLs concurrently, yielding (url, text) tuples as each one
+        completes; text is None for any URL that could not be fetched.
+        """
+        async def fetch(url):
+            return url, await self._fetch(
+                session, limiter, url, timeout, max_age
             )
-        )
 
-    def _extract_coupon_links_from_page(self, page_url):
-        """Fetch a page and extract all offers.greatclips.com links from it."""
+        for next_done in asyncio.as_completed([fetch(url) for url in urls]):
+            yield await next_done
+
+    def _extract_coupon_links_from_page(self, page_url, html):
+        """Extract all offers.greatclips.com links from a fetched page."""
         links = []
         try:
-            response = self.session.get(page_url, timeout=15)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'lxml')
-            for a_tag in soup.find_all('a', href=True):
-                href = a_tag['href']
-                if self._is_valid_coupon_url(href):
+            tree = LexborHTMLParser(html)
+            for node in tree.css('a[href]'):
+                href = (node.attributes.get('href') or '').strip(
+                    _C0_CONTROL_OR_SPACE
+                )
+                if href and self._is_valid_coupon_url(href):
                     links.append(href)
             logger.info(
                 "Found %d coupon links on %s", len(links), page_url
             )
-        except requests.exceptions.ConnectionError as e:
-            logger.error("Connection error fetching %s: %s", page_url, e)
-        except requests.exceptions.Timeout as e:
-            logger.error("Timeout fetching %s: %s", page_url, e)
-        except requests.exceptions.HTTPError as e:
-            logger.error("HTTP error fetching %s: %s", page_url, e)
         except Exception as e:
-            logger.error("Error fetching %s: %s", page_url, e)
+            logger.error("Error parsing %s: %s", page_url, e)
         return links
 
     def _google_search(self, query, num_results=10):
@@ -158,16 +431,17 @@ class GreatClipsScraper:
             )
             response = self.session.get(url, timeout=15)
             response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'lxml')
-            for a_tag in soup.find_all('a', href=True):
-                href = a_tag['href']
-                parsed = urlparse(href)
+            # Without a declared charset requests would run charset
+            # detection over the whole page on first .text access.
+            response.encoding = response.encoding or "utf-8"
+            tree = LexborHTMLParser(response.text)
+            # Organic results only; skips nav, footer and ad links.
+            for node in tree.css('li.b_algo h2 a[href]'):
+                href = node.attributes.get('href')
                 if (
-                    parsed.scheme in ("http", "https")
-                    and parsed.netloc
-                    and "bing.com" not in parsed.netloc
-                    and "microsoft.com" not in parsed.netloc
-                    and parsed.netloc != "offers.greatclips.com"
+                    href
+                    and href.startswith(("http://", "https://"))
+                    and "offers.greatclips.com" not in href
                 ):
                     pages.append(href)
         except requests.exceptions.ConnectionError as e:
@@ -179,43 +453,50 @@ class GreatClipsScraper:
         logger.info("Bing returned %d pages", len(pages))
         return pages
 
-    def discover_coupons(self, num_results=10):
+    async def discover_coupons(self, num_results=10, session=None,
+                               limiter=None):
         """
         Discover coupon URLs by:
         1. Searching multiple engines for pages that link to offers.greatclips.com
         2. Scraping those pages + known aggregators for coupon URLs
         3. Deduplicating results
+
+        This is an async generator: each unique coupon URL is yielded as soon
+        as the aggregator page listing it has been scraped. Pass `session`
+        and `limiter` to share them with the caller; otherwise they are
+        created here.
         """
+        if session is None:
+            async with _make_async_session() as session:
+                async for url in self.discover_coupons(
+                    num_results, session, limiter
+                ):
+                    yield url
+            return
+        if limiter is None:
+            limiter = _RequestLimiter()
+
         logger.info("Discovering coupon URLs...")
         query = '"offers.greatclips.com" coupon'
 
-        # Step 1: Gather aggregator pages from multiple search engines
-        aggregator_pages = []
-
-        google_pages = self._google_search(query, num_results)
-        aggregator_pages.extend(google_pages)
-        time.sleep(2)
-
-        ddg_pages = self._duckduckgo_search(query, num_results)
-        aggregator_pages.extend(ddg_pages)
-        time.sleep(2)
-
-        bing_pages = self._bing_search(query, num_results)
-        aggregator_pages.extend(bing_pages)
-
-        # Step 2: Add known aggregators
-        all_pages = list(aggregator_pages)
-        for known in KNOWN_AGGREGATORS:
-            if known not in all_pages:
-                all_pages.append(known)
-
-        # Deduplicate pages
-        seen_pages = set()
-        unique_pages = []
-        for p in all_pages:
-            if p not in seen_pages:
-                seen_pages.add(p)
-                unique_pages.append(p)
+        # Step 1: Gather aggregator pages from all search engines at once.
+        # The engines are blocking clients, so they run in worker threads.
+        engines = (
+            self._google_search,
+            self._duckduckgo_search,
+            self._bing_search,
+        )
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=len(engines)) as executor:
+            # gather keeps submission order so results stay deterministic.
+            results = await asyncio.gather(*(
+                loop.run_in_executor(executor, engine, query, num_results)
+                for engine in engines
+            ))
+        aggregator_pages = [page for pages in results for page in pages]
+
+        # Step 2: Add known aggregators, deduplicating in first-seen order
+        unique_pages = _dedupe_urls([*aggregator_pages, *KNOWN_AGGREGATORS])
 
         logger.info(
             "Total aggregator pages to scrape: %d (%d from search + %d known)",
@@ -224,80 +505,85 @@ class GreatClipsScraper:
             len(KNOWN_AGGREGATORS),
         )
 
-        # Step 3: Scrape each page for coupon links
-        all_coupon_urls = []
-        for page_url in unique_pages:
-            coupon_links = self._extract_coupon_links_from_page(page_url)
-            all_coupon_urls.extend(coupon_links)
-            time.sleep(1)
-
-        # Deduplicate coupon URLs
+        # Step 3: Fetch pages concurrently, yielding new links as they land
         seen = set()
-        unique = []
-        for url in all_coupon_urls:
-            if url not in seen:
-                seen.add(url)
-                unique.append(url)
-
-        if unique:
-            logger.info("Discovered %d unique coupon URLs total", len(unique))
+        async for page_url, html in self._fetch_iter(
+            session, limiter, unique_pages, max_age=AGGREGATOR_CACHE_TTL
+        ):
+            if html is None:
+                continue
+            for url in self._extract_coupon_links_from_page(page_url, html):
+                # Aggregators link the same coupon with cosmetic URL
+                # differences; dedupe on the canonical form, fetch the original.
+                key = _canonicalize_url(url)
+                if key not in seen:
+                    seen.add(key)
+                    yield url
+
+        if seen:
+            logger.info("Discovered %d unique coupon URLs total", len(seen))
         else:
             logger.warning("No coupon URLs discovered from any source.")
 
-        return unique
+    def extract_coupon_details(self, url, html):
+        """Extract area names and offer details from a fetched coupon page."""
+        # Most coupon pages never mention the target area; a regex scan of
+        # the raw HTML is far cheaper than building the tree to find out.
+        # Entities are decoded first so "Dallas &amp; Fort Worth" matches.
+        if not self._matches_area(unescape(html)):
+            return {
+                'url': url,
+                'area_text': '',
+                'offer_value': 'Unknown',
+                'is_target': False,
+            }
 
-    def extract_coupon_details(self, url):
-        """Extract area names and offer details from a specific coupon page."""
         try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.text, 'lxml')
+            tree = LexborHTMLParser(html)
 
-            description_text = ""
-            terms_text = ""
+            description_parts = []
+            terms_parts = []
 
-            offer_details = soup.find('div', id='offer-details')
+            offer_details = tree.css_first('div#offer-details')
             if offer_details:
                 current_section = None
-                for tag in offer_details.descendants:
-                    if tag.name == 'h4':
-                        heading = tag.get_text(strip=True).lower()
+                # Only the tags we care about, in document order.
+                for node in offer_details.css('h4, p, div, span, li'):
+                    if node.tag == 'h4':
+                        heading = node.text(strip=True).lower()
                         if 'description' in heading:
                             current_section = 'description'
                         elif 'term' in heading:
                             current_section = 'terms'
                         else:
                             current_section = None
-                    elif hasattr(tag, 'get_text') and tag.name in (
-                        'p', 'div', 'span', 'li',
-                    ):
-                        text = tag.get_text(strip=True)
+                    else:
+                        text = node.text(strip=True)
                         if text:
                             if current_section == 'description':
-                                description_text += " " + text
+                                description_parts.append(text)
                             elif current_section == 'terms':
-                                terms_text += " " + text
+                                terms_parts.append(text)
             else:
                 logger.warning(
                     "No #offer-details found on %s; falling back to body text", url
                 )
-                body = soup.find('body')
-                description_text = body.get_text(strip=True) if body else ""
+                body = tree.css_first('body')
+                if body:
+                    description_parts.append(body.text(strip=True))
 
-            description_text = description_text.strip()
-            terms_text = terms_text.strip()
+            description_text = " ".join(description_parts)
+            terms_text = " ".join(terms_parts)
 
             # Combine text for matching
             all_text = f"{description_text} {terms_text}"
 
             # Extract offer value (e.g., $9.99 or $2 off) from combined text
             offer_value = "Unknown"
-            match = re.search(
-                r'\$\d+(?:\.\d{2})?(?:\s*off)?', all_text, re.IGNORECASE
-            )
-            if match:
-                offer_value = match.group(0)
+            if "$" in all_text:
+                match = _OFFER_RE.search(all_text)
+                if match:
+                    offer_value = match.group(0)
 
             return {
                 'url': url,
@@ -305,15 +591,6 @@ class GreatClipsScraper:
                 'offer_value': offer_value,
                 'is_target': self._matches_area(all_text),
             }
-        except requests.exceptions.ConnectionError as e:
-            logger.error("Connection error extracting %s: %s", url, e)
-            return None
-        except requests.exceptions.Timeout as e:
-            logger.error("Timeout extracting %s: %s", url, e)
-            return None
-        except requests.exceptions.HTTPError as e:
-            logger.error("HTTP error extracting %s: %s", url, e)
-            return None
         except (AttributeError, TypeError) as e:
             logger.error("Parse error extracting %s: %s", url, e)
             return None
@@ -321,32 +598,72 @@ class GreatClipsScraper:
             logger.error("Unexpected error extracting %s: %s", url, e)
             return None
 
-    def run(self, limit=10):
-        urls = self.discover_coupons(num_results=limit)
-        if not urls:
-            return self.found_coupons
-
-        logger.info(
-            "Found %d potential coupon URLs. Scraping details...", len(urls)
-        )
-
-        total = len(urls)
-        for i, url in enumerate(urls, 1):
-            print(
-                f"\r  Checking coupon {i}/{total} "
-                f"({len(self.found_coupons)} matches so far)...",
-                end="", flush=True,
-            )
-            details = self.extract_coupon_details(url)
-            if details and details['is_target']:
-                logger.info(
-                    "\nFOUND MATCH: %s (%s) for %s",
-                    url, details['offer_value'], self.target_area,
-                )
-                self.found_coupons.append(details)
-            time.sleep(1)  # Be polite
-
-        print()  # newline after progress
+    async def _check_coupons(self, limit, concurrency):
+        """
+        Pipeline discovery into detail checks: coupon URLs are queued as
+        discover_coupons yields them and `concurrency` workers fetch and
+        check each one while discovery is still running.
+        """
+        queue = asyncio.Queue(maxsize=concurrency * 2)
+        limiter = _RequestLimiter(concurrency)
+        checked = 0
+
+        async with _make_async_session(concurrency) as session:
+
+            async def worker():
+                nonlocal checked
+                while True:
+                    url = await queue.get()
+                    try:
+                        html = await self._fetch(
+                            session, limiter, url,
+                            timeout=10, max_age=COUPON_CACHE_TTL,
+                        )
+                        details = (
+                            self.extract_coupon_details(url, html)
+                            if html is not None else None
+                        )
+                        if details and details['is_target']:
+                            logger.info(
+                                "\nFOUND MATCH: %s (%s) for %s",
+                                url, details['offer_value'], self.target_area,
+                            )
+                            self.found_coupons.append(details)
+                        checked += 1
+                        print(
+                            f"\r  Checked {checked} coupons "
+                            f"({len(self.found_coupons)} matches so far)...",
+                            end="", flush=True,
+                        )
+                    finally:
+                        queue.task_done()
+
+            workers = [
+                asyncio.create_task(worker()) for _ in range(concurrency)
+            ]
+            try:
+                async for url in self.discover_coupons(
+                    limit, session, limiter
+                ):
+                    await queue.put(url)
+                await queue.join()
+            finally:
+                for task in workers:
+                    task.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+                if self.cache:
+                    self.cache.commit()
+
+        return checked
+
+    def run(self, limit=10, concurrency=20):
+        try:
+            checked = asyncio.run(self._check_coupons(limit, concurrency))
+        finally:
+            if self.cache:
+                self.cache.close()
+        if checked:
+            print()  # newline after progress
 
         if not self.found_coupons:
             logger.info("No coupons found for area: '%s'", self.target_area)
@@ -433,6 +750,173 @@ def _mock_response(html, status_code=200):
     return resp
 
 
+def _mock_async_session(html="", status_code=200, side_effect=None,
+                        headers=None, delay=0, charset="utf-8"):
+    """
+    Build a stand-in for an aiohttp.ClientSession.
+
+    `html` is served for every URL, or looked up per URL when it is a dict
+    (unknown URLs get an empty page). Each response takes `delay` seconds;
+    the peak number of requests open at once is kept in `max_in_flight`.
+    """
+    in_flight = {'now': 0}
+
+    def make_response(url, **kwargs):
+        page = html.get(url, "") if isinstance(html, dict) else html
+        body = page.encode("utf-8")
+
+        async def iter_chunked(size):
+            for start in range(0, len(body), size):
+                yield body[start:start + size]
+
+        resp = Mock()
+        resp.status = status_code
+        resp.headers = headers or {}
+        resp.charset = charset
+        resp.content.iter_chunked = iter_chunked
+        resp.raise_for_status = Mock()
+        if status_code >= 400:
+            resp.raise_for_status.side_effect = aiohttp.ClientResponseError(
+                Mock(), (), status=status_code
+            )
+
+        async def enter(*args):
+            in_flight['now'] += 1
+            session.max_in_flight = max(
+                session.max_in_flight, in_flight['now']
+            )
+            await asyncio.sleep(delay)
+            return resp
+
+        async def exit_(*exc_info):
+            in_flight['now'] -= 1
+
+        request_ctx = MagicMock()
+        request_ctx.__aenter__.side_effect = enter
+        request_ctx.__aexit__.side_effect = exit_
+        return request_ctx
+
+    session = MagicMock()
+    session.max_in_flight = 0
+    session.__aenter__.return_value = session
+    session.get.side_effect = side_effect or make_response
+    return session
+
+
+def _mock_search_engines(mock_google, mock_ddgs_cls, google=(), ddg=()):
+    """Point the patched Google/DDG clients at canned result lists."""
+    mock_google.return_value = iter(google)
+    mock_ddgs_inst = Mock()
+    mock_ddgs_cls.return_value = mock_ddgs_inst
+    mock_ddgs_inst.text.return_value = [{"href": url} for url in ddg]
+    return mock_ddgs_inst
+
+
+def _discover(scraper, session, num_results=5):
+    """Drain discover_coupons into a list using a mocked aiohttp session."""
+    async def collect():
+        return [url async for url in scraper.discover_coupons(num_results)]
+    with patch("__main__._make_async_session", return_value=session):
+        return asyncio.run(collect())
+
+
+class TestCanonicalizeURL(unittest.TestCase):
+
+    def test_normalizes_cosmetic_differences(self):
+        self.assertEqual(
+            _canonicalize_url("HTTPS://Offers.GreatClips.com/abc123/#terms"),
+            "https://offers.greatclips.com/abc123",
+        )
+
+    def test_sorts_query_and_keeps_path_case(self):
+        self.assertEqual(
+            _canonicalize_url("https://example.com/Deals/?b=2&a=1"),
+            "https://example.com/Deals?a=1&b=2",
+        )
+
+    def test_keeps_blank_query_values(self):
+        self.assertNotEqual(
+            _canonicalize_url("https://a.com/list?a=&b=1"),
+            _canonicalize_url("https://a.com/list?b=1"),
+        )
+        self.assertEqual(
+            _canonicalize_url("https://a.com/list?page"),
+            "https://a.com/list?page=",
+        )
+
+    def test_keeps_path_params(self):
+        self.assertEqual(
+            _canonicalize_url("https://a.com/p;v=2"), "https://a.com/p;v=2"
+        )
+        self.assertNotEqual(
+            _canonicalize_url("https://a.com/p;v=2"),
+            _canonicalize_url("https://a.com/p"),
+        )
+
+    def test_unparseable_url_is_its_own_key(self):
+        self.assertEqual(_canonicalize_url("https://[bad/x"), "https://[bad/x")
+        self.assertEqual(
+            _dedupe_urls(["https://[bad/x", "https://example.com/"]),
+            ["https://[bad/x", "https://example.com/"],
+        )
+
+    def test_dedupe_keeps_first_original(self):
+        self.assertEqual(
+            _dedupe_urls([
+                "https://offers.greatclips.com/abc/",
+                "https://offers.greatclips.com/abc#x",
+                "https://offers.greatclips.com/def",
+            ]),
+            [
+                "https://offers.greatclips.com/abc/",
+                "https://offers.greatclips.com/def",
+            ],
+        )
+
+
+class TestPageCache(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "cache.sqlite")
+
+    def test_writes_persist_only_after_commit(self):
+        cache = _PageCache(self.path)
+        self.addCleanup(cache.close)
+        cache.set("https://offers.greatclips.com/a", "<html></html>")
+        other = _PageCache(self.path)
+        self.addCleanup(other.close)
+        self.assertIsNone(other.get("https://offers.greatclips.com/a"))
+        cache.commit()
+        self.assertEqual(
+            other.get("https://offers.greatclips.com/a")["body"],
+            "<html></html>",
+        )
+
+    def test_close_commits_and_reopens_on_use(self):
+        cache = _PageCache(self.path)
+        cache.set("https://offers.greatclips.com/a", "<html></html>", '"v1"')
+        cache.close()
+        cached = cache.get("https://offers.greatclips.com/a")
+        self.assertEqual(cached["etag"], '"v1"')
+        cache.close()
+
+
+class TestMakeSession(unittest.TestCase):
+
+    def test_mounts_pooled_retrying_adapter(self):
+        session = _make_session()
+        for prefix in ("http://", "https://"):
+            adapter = session.get_adapter(prefix + "example.com")
+            self.assertIsInstance(adapter, HTTPAdapter)
+            self.assertEqual(adapter._pool_maxsize, 64)
+            self.assertEqual(adapter.max_retries.total, 2)
+            self.assertIn(503, adapter.max_retries.status_forcelist)
+            self.assertFalse(adapter.max_retries.respect_retry_after_header)
+        self.assertEqual(session.headers["User-Agent"], HEADERS["User-Agent"])
+
+
 class TestAreaMatching(unittest.TestCase):
 
     def test_exact_match(self):
@@ -443,6 +927,10 @@ class TestAreaMatching(unittest.TestCase):
         scraper = GreatClipsScraper("wilmington")
         self.assertTrue(scraper._matches_area("WILMINGTON area"))
 
+    def test_casefold_match(self):
+        scraper = GreatClipsScraper("Straße")
+        self.assertTrue(scraper._matches_area("Offer valid on STRASSE only"))
+
     def test_no_match(self):
         scraper = GreatClipsScraper("Kansas City")
         self.assertFalse(scraper._matches_area("Valid in Wilmington, DE only"))
@@ -495,179 +983,376 @@ class TestURLValidation(unittest.TestCase):
             )
         )
 
+    def test_root_path_with_fragment_or_query(self):
+        self.assertFalse(
+            GreatClipsScraper._is_valid_coupon_url(
+                "https://offers.greatclips.com/#top"
+            )
+        )
+        self.assertFalse(
+            GreatClipsScraper._is_valid_coupon_url(
+                "https://offers.greatclips.com/?ref=x"
+            )
+        )
+
+    def test_lookalike_domain(self):
+        self.assertFalse(
+            GreatClipsScraper._is_valid_coupon_url(
+                "https://offers.greatclips.com.evil.example/abc"
+            )
+        )
+
+    def test_surrounding_whitespace(self):
+        for url in (
+            " https://offers.greatclips.com/abc",
+            "\nhttps://offers.greatclips.com/abc\n",
+            "\t https://offers.greatclips.com/abc ",
+        ):
+            self.assertTrue(GreatClipsScraper._is_valid_coupon_url(url), url)
+
     def test_empty_string(self):
         self.assertFalse(GreatClipsScraper._is_valid_coupon_url(""))
 
+    def test_non_string_input(self):
+        for url in (None, 42, ["https://offers.greatclips.com/abc"]):
+            self.assertFalse(GreatClipsScraper._is_valid_coupon_url(url))
+
     def test_nonsense(self):
         self.assertFalse(GreatClipsScraper._is_valid_coupon_url("not a url"))
 
 
 class TestExtractCouponDetails(unittest.TestCase):
 
-    def _make_scraper(self, area, mock_session_get):
-        scraper = GreatClipsScraper(area)
-        scraper.session = Mock()
-        scraper.session.get = mock_session_get
-        return scraper
-
     def test_wilmington_area_match(self):
-        mock_get = Mock(return_value=_mock_response(WILMINGTON_HTML))
-        scraper = self._make_scraper("Wilmington", mock_get)
+        scraper = GreatClipsScraper("Wilmington")
         details = scraper.extract_coupon_details(
-            "https://offers.greatclips.com/7GqMiDg"
+            "https://offers.greatclips.com/7GqMiDg", WILMINGTON_HTML
         )
         self.assertIsNotNone(details)
         self.assertTrue(details["is_target"])
         self.assertEqual(details["offer_value"], "$8.99")
 
+    def test_area_match_ignores_case_in_raw_html(self):
+        scraper = GreatClipsScraper("WILMINGTON")
+        details = scraper.extract_coupon_details(
+            "https://offers.greatclips.com/7GqMiDg", WILMINGTON_HTML
+        )
+        self.assertTrue(details["is_target"])
+
+    def test_area_written_with_html_entities(self):
+        for area, escaped in (
+            ("Dallas & Fort Worth", "Dallas &amp; Fort Worth"),
+            ("Coeur d'Alene", "Coeur d&#39;Alene"),
+        ):
+            scraper = GreatClipsScraper(area)
+            details = scraper.extract_coupon_details(
+                "https://offers.greatclips.com/abc",
+                '<div id="offer-details"><h4>Description</h4>'
+                f'<p>$7.99 haircut in {escaped}.</p></div>',
+            )
+            self.assertTrue(details["is_target"], area)
+            self.assertEqual(details["offer_value"], "$7.99")
+
     def test_non_matching_area(self):
-        mock_get = Mock(return_value=_mock_response(WILMINGTON_HTML))
-        scraper = self._make_scraper("Kansas City", mock_get)
+        scraper = GreatClipsScraper("Kansas City")
         details = scraper.extract_coupon_details(
-            "https://offers.greatclips.com/7GqMiDg"
+            "https://offers.greatclips.com/7GqMiDg", WILMINGTON_HTML
         )
         self.assertIsNotNone(details)
         self.assertFalse(details["is_target"])
 
     def test_dollar_off_extraction(self):
-        mock_get = Mock(return_value=_mock_response(NO_AREA_HTML))
-        scraper = self._make_scraper("Anywhere", mock_get)
+        scraper = GreatClipsScraper("Nationwide")
         details = scraper.extract_coupon_details(
-            "https://offers.greatclips.com/xyz"
+            "https://offers.greatclips.com/xyz", NO_AREA_HTML
         )
         self.assertIsNotNone(details)
         self.assertEqual(details["offer_value"], "$2 off")
 
     def test_value_in_terms_section(self):
-        mock_get = Mock(return_value=_mock_response(VALUE_IN_TERMS_HTML))
-        scraper = self._make_scraper("Springfield", mock_get)
+        scraper = GreatClipsScraper("Springfield")
         details = scraper.extract_coupon_details(
-            "https://offers.greatclips.com/abc"
+            "https://offers.greatclips.com/abc", VALUE_IN_TERMS_HTML
         )
         self.assertIsNotNone(details)
         self.assertTrue(details["is_target"])
         self.assertEqual(details["offer_value"], "$5.99 off")
 
+    @patch("__main__.LexborHTMLParser")
+    def test_area_absent_skips_parsing(self, mock_parser):
+        scraper = GreatClipsScraper("Kansas City")
+        details = scraper.extract_coupon_details(
+            "https://offers.greatclips.com/7GqMiDg", WILMINGTON_HTML
+        )
+        mock_parser.assert_not_called()
+        self.assertFalse(details["is_target"])
+        self.assertEqual(details["offer_value"], "Unknown")
+
     def test_fallback_when_no_offer_details_div(self):
-        mock_get = Mock(return_value=_mock_response(NO_OFFER_DETAILS_HTML))
-        scraper = self._make_scraper("Wilmington", mock_get)
+        scraper = GreatClipsScraper("Wilmington")
         details = scraper.extract_coupon_details(
-            "https://offers.greatclips.com/fallback"
+            "https://offers.greatclips.com/fallback", NO_OFFER_DETAILS_HTML
         )
         self.assertIsNotNone(details)
         self.assertTrue(details["is_target"])
         self.assertEqual(details["offer_value"], "Unknown")
 
+
+class TestFetch(unittest.TestCase):
+
+    def _fetch(self, session, url, scraper=None, **kwargs):
+        scraper = scraper or GreatClipsScraper("Test")
+
+        async def fetch():
+            return await scraper._fetch(
+                session, _RequestLimiter(), url, **kwargs
+            )
+        return asyncio.run(fetch())
+
+    def test_returns_page_text(self):
+        session = _mock_async_session(WILMINGTON_HTML)
+        text = self._fetch(session, "https://offers.greatclips.com/a")
+        self.assertEqual(text, WILMINGTON_HTML)
+
     def test_http_error_returns_none(self):
-        mock_get = Mock(return_value=_mock_response("", status_code=404))
-        scraper = self._make_scraper("Wilmington", mock_get)
-        details = scraper.extract_coupon_details(
-            "https://offers.greatclips.com/gone"
+        session = _mock_async_session(status_code=404)
+        self.assertIsNone(
+            self._fetch(session, "https://offers.greatclips.com/gone")
         )
-        self.assertIsNone(details)
 
     def test_connection_error_returns_none(self):
-        mock_get = Mock(
-            side_effect=requests.exceptions.ConnectionError("refused")
+        session = _mock_async_session(
+            side_effect=aiohttp.ClientConnectionError("refused")
         )
-        scraper = self._make_scraper("Wilmington", mock_get)
-        details = scraper.extract_coupon_details(
-            "https://offers.greatclips.com/err"
+        self.assertIsNone(
+            self._fetch(session, "https://offers.greatclips.com/err")
         )
-        self.assertIsNone(details)
 
     def test_timeout_returns_none(self):
-        mock_get = Mock(
-            side_effect=requests.exceptions.Timeout("timed out")
+        session = _mock_async_session(side_effect=asyncio.TimeoutError())
+        self.assertIsNone(
+            self._fetch(session, "https://offers.greatclips.com/slow")
         )
-        scraper = self._make_scraper("Wilmington", mock_get)
-        details = scraper.extract_coupon_details(
-            "https://offers.greatclips.com/slow"
-        )
-        self.assertIsNone(details)
+
+    def test_stores_fetched_page_in_cache(self):
+        url = "https://offers.greatclips.com/a"
+        scraper = GreatClipsScraper("Test", cache_path=":memory:")
+        session = _mock_async_session(WILMINGTON_HTML, headers={"ETag": '"v1"'})
+        self._fetch(session, url, scraper)
+        cached = scraper.cache.get(url)
+        self.assertEqual(cached["body"], WILMINGTON_HTML)
+        self.assertEqual(cached["etag"], '"v1"')
+
+    def test_fresh_cache_entry_skips_network(self):
+        url = "https://offers.greatclips.com/a"
+        scraper = GreatClipsScraper("Test", cache_path=":memory:")
+        scraper.cache.set(url, WILMINGTON_HTML)
+        session = _mock_async_session(NO_AREA_HTML)
+        text = self._fetch(session, url, scraper, max_age=60)
+        self.assertEqual(text, WILMINGTON_HTML)
+        session.get.assert_not_called()
+
+    def test_stale_cache_entry_revalidates(self):
+        url = "https://offers.greatclips.com/a"
+        scraper = GreatClipsScraper("Test", cache_path=":memory:")
+        scraper.cache.set(url, WILMINGTON_HTML, etag='"v1"')
+        session = _mock_async_session(status_code=304)
+        text = self._fetch(session, url, scraper, max_age=0)
+        self.assertEqual(text, WILMINGTON_HTML)
+        _, kwargs = session.get.call_args
+        self.assertEqual(kwargs["headers"], {"If-None-Match": '"v1"'})
+
+    def test_limiter_bounds_requests_in_flight(self):
+        scraper = GreatClipsScraper("Test")
+        urls = [f"https://offers.greatclips.com/c{i}" for i in range(10)]
+        session = _mock_async_session(WILMINGTON_HTML, delay=0.01)
+
+        async def fetch_all():
+            limiter = _RequestLimiter(3)
+            return [
+                result async for result in scraper._fetch_iter(
+                    session, limiter, urls, timeout=1
+                )
+            ]
+        results = asyncio.run(fetch_all())
+        self.assertEqual(session.max_in_flight, 3)
+        self.assertEqual(sorted(url for url, _ in results), sorted(urls))
+        self.assertTrue(all(text == WILMINGTON_HTML for _, text in results))
+
+    def test_limiter_caps_requests_per_host(self):
+        scraper = GreatClipsScraper("Test")
+        urls = [f"https://offers.greatclips.com/c{i}" for i in range(12)]
+        session = _mock_async_session(WILMINGTON_HTML, delay=0.01)
+
+        async def fetch_all():
+            return [
+                result async for result in scraper._fetch_iter(
+                    session, _RequestLimiter(20), urls, timeout=1
+                )
+            ]
+        results = asyncio.run(fetch_all())
+        self.assertEqual(session.max_in_flight, MAX_CONNECTIONS_PER_HOST)
+        self.assertTrue(all(text == WILMINGTON_HTML for _, text in results))
+
+    def test_unknown_declared_charset_falls_back_to_utf8(self):
+        session = _mock_async_session(WILMINGTON_HTML, charset="utf8mb4")
+        text = self._fetch(session, "https://offers.greatclips.com/a")
+        self.assertEqual(text, WILMINGTON_HTML)
+
+    def test_oversized_body_is_truncated(self):
+        session = _mock_async_session("x" * (MAX_BODY_BYTES + 100000))
+        text = self._fetch(session, "https://example.com/huge")
+        self.assertEqual(len(text), MAX_BODY_BYTES)
 
 
 class TestExtractCouponLinksFromPage(unittest.TestCase):
 
     def test_extracts_valid_links(self):
         scraper = GreatClipsScraper("Test")
-        scraper.session = Mock()
-        scraper.session.get.return_value = _mock_response(AGGREGATOR_HTML)
-        links = scraper._extract_coupon_links_from_page("https://example.com")
+        links = scraper._extract_coupon_links_from_page(
+            "https://example.com", AGGREGATOR_HTML
+        )
         self.assertEqual(len(links), 3)
         self.assertIn("https://offers.greatclips.com/abc1234", links)
         self.assertIn("https://offers.greatclips.com/xyz5678", links)
 
-    def test_connection_error_returns_empty(self):
+    def test_strips_whitespace_around_href(self):
         scraper = GreatClipsScraper("Test")
-        scraper.session = Mock()
-        scraper.session.get.side_effect = requests.exceptions.ConnectionError(
-            "refused"
+        links = scraper._extract_coupon_links_from_page(
+            "https://example.com",
+            '<a href="\n  https://offers.greatclips.com/abc1234 ">A</a>',
         )
-        links = scraper._extract_coupon_links_from_page("https://example.com")
-        self.assertEqual(links, [])
+        self.assertEqual(links, ["https://offers.greatclips.com/abc1234"])
 
     def test_no_coupon_links_returns_empty(self):
+        scraper = GreatClipsScraper("Test")
+        links = scraper._extract_coupon_links_from_page(
+            "https://example.com",
+            "<html><body><a href='https://example.com'>nope</a></body></html>",
+        )
+        self.assertEqual(links, [])
+
+
+class TestBingSearch(unittest.TestCase):
+
+    def test_returns_organic_result_links_only(self):
         scraper = GreatClipsScraper("Test")
         scraper.session = Mock()
         scraper.session.get.return_value = _mock_response(
-            "<html><body><a href='https://example.com'>nope</a></body></html>"
+            '<html><body>'
+            '<a href="https://www.bing.com/images">Images</a>'
+            '<ol id="b_results">'
+            '<li class="b_algo"><h2>'
+            '<a href="https://deal-site.com/coupons">Deals</a></h2>'
+            '<a href="https://deal-site.com/other">Sitelink</a></li>'
+            '<li class="b_algo"><h2>'
+            '<a href="https://offers.greatclips.com/abc">Coupon</a></h2></li>'
+            '<li class="b_algo"><h2><a href="/relative">Relative</a></h2></li>'
+            '</ol>'
+            '<a href="https://www.microsoft.com/privacy">Privacy</a>'
+            '</body></html>'
         )
-        links = scraper._extract_coupon_links_from_page("https://example.com")
-        self.assertEqual(links, [])
+        pages = scraper._bing_search("query")
+        self.assertEqual(pages, ["https://deal-site.com/coupons"])
+
+    def test_undeclared_charset_defaults_to_utf8(self):
+        scraper = GreatClipsScraper("Test")
+        scraper.session = Mock()
+        response = _mock_response("<html></html>")
+        response.encoding = None
+        scraper.session.get.return_value = response
+        scraper._bing_search("query")
+        self.assertEqual(response.encoding, "utf-8")
 
 
 class TestDiscoverCoupons(unittest.TestCase):
 
-    @patch("__main__.time.sleep")
     @patch("__main__.DDGS")
     @patch("__main__.search")
-    def test_combines_all_sources(self, mock_google, mock_ddgs_cls, mock_sleep):
-        mock_google.return_value = iter(["https://deal-site.com/coupons"])
-        mock_ddgs_inst = Mock()
-        mock_ddgs_cls.return_value = mock_ddgs_inst
-        mock_ddgs_inst.text.return_value = [
-            {"href": "https://another-site.com/deals"}
-        ]
+    def test_combines_all_sources(self, mock_google, mock_ddgs_cls):
+        mock_ddgs_inst = _mock_search_engines(
+            mock_google, mock_ddgs_cls,
+            google=["https://deal-site.com/coupons"],
+            ddg=["https://another-site.com/deals"],
+        )
         scraper = GreatClipsScraper("Test")
         scraper.session = Mock()
-        scraper.session.get.return_value = _mock_response(
+        scraper.session.get.return_value = _mock_response("")
+        session = _mock_async_session(
             '<html><body><a href="https://offers.greatclips.com/aaa">A</a></body></html>'
         )
-        urls = scraper.discover_coupons(num_results=5)
+        urls = _discover(scraper, session)
         self.assertIn("https://offers.greatclips.com/aaa", urls)
         mock_google.assert_called_once()
         mock_ddgs_inst.text.assert_called_once()
+        fetched = {call.args[0] for call in session.get.call_args_list}
+        self.assertIn("https://deal-site.com/coupons", fetched)
+        self.assertIn("https://another-site.com/deals", fetched)
 
-    @patch("__main__.time.sleep")
     @patch("__main__.DDGS")
     @patch("__main__.search")
-    def test_deduplicates_urls(self, mock_google, mock_ddgs_cls, mock_sleep):
-        mock_google.return_value = iter([])
-        mock_ddgs_inst = Mock()
-        mock_ddgs_cls.return_value = mock_ddgs_inst
-        mock_ddgs_inst.text.return_value = []
+    def test_deduplicates_urls(self, mock_google, mock_ddgs_cls):
+        _mock_search_engines(mock_google, mock_ddgs_cls)
         scraper = GreatClipsScraper("Test")
         scraper.session = Mock()
-        scraper.session.get.return_value = _mock_response(AGGREGATOR_HTML)
-        urls = scraper.discover_coupons(num_results=5)
+        scraper.session.get.return_value = _mock_response("")
+        urls = _discover(scraper, _mock_async_session(AGGREGATOR_HTML))
         self.assertEqual(urls.count("https://offers.greatclips.com/abc1234"), 1)
 
-    @patch("__main__.time.sleep")
+    @patch("__main__.DDGS")
+    @patch("__main__.search")
+    def test_deduplicates_url_variants(self, mock_google, mock_ddgs_cls):
+        _mock_search_engines(mock_google, mock_ddgs_cls)
+        scraper = GreatClipsScraper("Test")
+        scraper.session = Mock()
+        scraper.session.get.return_value = _mock_response("")
+        session = _mock_async_session(
+            '<html><body>'
+            '<a href="https://offers.greatclips.com/abc1234">A</a>'
+            '<a href="https://offers.greatclips.com/abc1234/">A</a>'
+            '<a href="https://OFFERS.greatclips.com/abc1234#terms">A</a>'
+            '</body></html>'
+        )
+        urls = _discover(scraper, session)
+        self.assertEqual(urls, ["https://offers.greatclips.com/abc1234"])
+
     @patch("__main__.DDGS")
     @patch("__main__.search")
     def test_all_engines_fail_still_uses_known_aggregators(
-        self, mock_google, mock_ddgs_cls, mock_sleep
+        self, mock_google, mock_ddgs_cls
     ):
         mock_google.side_effect = Exception("rate limited")
         mock_ddgs_cls.side_effect = Exception("blocked")
         scraper = GreatClipsScraper("Test")
         scraper.session = Mock()
-        scraper.session.get.return_value = _mock_response(AGGREGATOR_HTML)
-        urls = scraper.discover_coupons(num_results=5)
+        scraper.session.get.return_value = _mock_response("")
+        urls = _discover(scraper, _mock_async_session(AGGREGATOR_HTML))
         self.assertTrue(len(urls) > 0)
 
 
+class TestRun(unittest.TestCase):
+
+    @patch("__main__.DDGS")
+    @patch("__main__.search")
+    def test_checks_discovered_coupons(self, mock_google, mock_ddgs_cls):
+        _mock_search_engines(mock_google, mock_ddgs_cls)
+        pages = {url: AGGREGATOR_HTML for url in KNOWN_AGGREGATORS}
+        pages["https://offers.greatclips.com/abc1234"] = WILMINGTON_HTML
+        pages["https://offers.greatclips.com/xyz5678"] = NO_AREA_HTML
+        scraper = GreatClipsScraper("Wilmington")
+        scraper.session = Mock()
+        scraper.session.get.return_value = _mock_response("")
+        session = _mock_async_session(pages)
+        with patch("__main__._make_async_session", return_value=session), \
+                patch("builtins.print"):
+            results = scraper.run(limit=5, concurrency=2)
+        self.assertEqual(
+            [r["url"] for r in results],
+            ["https://offers.greatclips.com/abc1234"],
+        )
+        self.assertEqual(results[0]["offer_value"], "$8.99")
+
+
 if __name__ == "__main__":
     logging.basicConfig(
         level=logging.INFO,
@@ -683,6 +1368,10 @@ if __name__ == "__main__":
         "--limit", type=int, default=20,
         help="Number of search results per engine to check",
     )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help=f"Do not read or write the page cache ({CACHE_PATH})",
+    )
     parser.add_argument(
         "--test", action="store_true",
         help="Run unit tests instead of scraping",
@@ -698,7 +1387,9 @@ if __name__ == "__main__":
     else:
         if not args.area:
             parser.error("--area is required when not running tests")
-        scraper = GreatClipsScraper(args.area)
+        scraper = GreatClipsScraper(
+            args.area, cache_path=None if args.no_cache else CACHE_PATH
+        )
         results = scraper.run(limit=args.limit)
 
         if results: